@@ -1,3 +1,6 @@
+from app import startup
+import os
+import threading
 from flask import Flask
 from flask_cors import CORS
 from flask_pymongo import PyMongo
@@ -8,7 +11,13 @@ from flask_bcrypt import Bcrypt
 mongo = PyMongo()
 bcrypt = Bcrypt()
 
+_init_lock = threading.Lock()
+
 def create_app():
+    """
+    Build the app without touching Mongo or the network - that is deferred
+    to init_backend (first request or warm-up thread) or warm_app (explicit warm hook)
+    """
     app = Flask(__name__)
     
     # Load configuration
@@ -16,7 +25,6 @@ def create_app():
     app.config['MONGO_URI'] = Config.MONGO_URI
     
     # Initialize extensions with app
-    mongo.init_app(app)
     bcrypt.init_app(app)
     
     # Configure CORS
@@ -32,9 +40,95 @@ def create_app():
     from app.routes.routes import main_bp
     app.register_blueprint(main_bp, url_prefix='/api')
     
+    @app.before_request
+    def lazy_init():
+        init_backend(app)
+    
+    @app.after_request
+    def track_startup(response):
+        startup.mark_response(response.status_code)
+        return response
+    
     # Health check endpoint
+    from app.services.warmup_service import warmup_service
+    
     @app.route('/health')
     def health_check():
-        return {'status': 'healthy', 'service': 'Event Hub API'}, 200
+        return {
+            'status': 'healthy',
+            'service': 'Event Hub API',
+            'warmup': warmup_service.status(),
+            'startup': startup.report()
+        }, 200
+    
+    # Warm-up starts with the worker, not with its first request
+    if Config.WARMUP_ENABLED:
+        start_warmup(app)
+        # Threads do not survive a fork (gunicorn --preload), restart it in each child
+        os.register_at_fork(after_in_child=lambda: start_warmup(app))
+    
+    startup.mark('app_created_ms')
+    return app
+
+def start_warmup(app):
+    """
+    Start the warm-up scheduler in this process; its thread runs
+    init_backend itself, so the caller never waits on Mongo
+    """
+    from app.services.warmup_service import warmup_service
+    
+    warmup_service.start(before_first_run=lambda: init_backend(app))
+
+def init_backend(app, check_indexes_in_background=True):
+    """
+    Create the Mongo client and wire the route models; runs once per app and
+    process - a worker forked from an initialized parent (gunicorn --preload)
+    gets its own client and threads instead of the parent's
+    """
+    if app.extensions.get('event_hub_pid') == os.getpid():
+        return
+    
+    with _init_lock:
+        if app.extensions.get('event_hub_pid') == os.getpid():
+            return
+    
+        from app.routes.routes import init_routes
+        from app.services.token_service import token_service
+    
+        # connect=False (Flask-PyMongo default) - no socket is opened until the first query
+        mongo.init_app(app)
+        init_routes(mongo, bcrypt)
+    
+        # Index checks block on the server, keep them off the request path
+        if check_indexes_in_background:
+            threading.Thread(target=ensure_indexes, name='ensure-indexes', daemon=True).start()
+    
+        token_service.start()
+    
+        app.extensions['event_hub_pid'] = os.getpid()
+        startup.mark('backend_ready_ms')
+
+def warm_app(app):
+    """
+    Explicit warm hook: do all deferred initialization now, before traffic arrives
+    """
+    from app.services.event_service import event_service
+    
+    init_backend(app, check_indexes_in_background=False)
+    ensure_indexes()
+    event_service.warm()
+    startup.mark('warmed_ms')
+
+def ensure_indexes():
+    from app.routes import routes
+    from app.services.event_service import event_service
+    from app.services.token_service import token_service
+    from app.services.warmup_service import warmup_service
     
-    return app
\ No newline at end of file
+    try:
+        routes.user_model.ensure_indexes()
+        event_service.ensure_indexes()
+        token_service.ensure_indexes()
+        warmup_service.ensure_indexes()
+    except Exception as e:
+        print(f"Index check error: {str(e)}")
\ No newline at end of file
@@ -1,8 +1,10 @@
 import os
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Load environment variables from .env (set LOAD_DOTENV=False where the
+# environment is provided directly, to skip the import and file lookup)
+if os.getenv('LOAD_DOTENV', 'True') == 'True':
+    from dotenv import load_dotenv
+    load_dotenv()
 
 class Config:
     """
@@ -12,6 +14,12 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
     DEBUG = os.getenv('FLASK_DEBUG', 'True') == 'True'
     
+    # Auth token Configuration - old keys stay valid for verification after rotation
+    PREVIOUS_SECRET_KEYS = [k for k in os.getenv('PREVIOUS_SECRET_KEYS', '').split(',') if k]
+    TOKEN_EXPIRY_SECONDS = int(os.getenv('TOKEN_EXPIRY_SECONDS', 24 * 60 * 60))
+    TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', 1024))
+    TOKEN_DENYLIST_REFRESH_SECONDS = int(os.getenv('TOKEN_DENYLIST_REFRESH_SECONDS', 60))
+    
     # MongoDB Configuration - connection string
     MONGO_URI = os.getenv('MONGO_URI', 'mongodb://localhost:27017/eventhub')
     
@@ -19,9 +27,32 @@ class Config:
     TICKETMASTER_API_KEY = os.getenv('TICKETMASTER_API_KEY', 'rJl9LnZCTj5lHVrGDbdObgTiRRmlnSdk')
     TICKETMASTER_BASE_URL = 'https://app.ticketmaster.com/discovery/v2'
     
+    # Search response cache
+    EVENT_CACHE_TTL_SECONDS = int(os.getenv('EVENT_CACHE_TTL_SECONDS', 60 * 60))
+    EVENT_CACHE_SIZE = int(os.getenv('EVENT_CACHE_SIZE', 512))
+    
+    # Parse Ticketmaster search payloads incrementally instead of response.json()
+    STREAM_EVENT_PARSING = os.getenv('STREAM_EVENT_PARSING', 'True') == 'True'
+    
+    # Cache warm-up - replays the most popular searches at startup and on a schedule into the
+    # search cache shared through Mongo, so one replay serves every worker. The upstream budget
+    # is likewise shared by all workers per window; Ticketmaster's default quota is 5000 calls/day
+    WARMUP_ENABLED = os.getenv('WARMUP_ENABLED', 'True') == 'True'
+    WARMUP_TOP_N = int(os.getenv('WARMUP_TOP_N', 50))
+    WARMUP_INTERVAL_SECONDS = int(os.getenv('WARMUP_INTERVAL_SECONDS', 10 * 60))
+    WARMUP_UPSTREAM_BUDGET = int(os.getenv('WARMUP_UPSTREAM_BUDGET', 60))
+    WARMUP_BUDGET_WINDOW_SECONDS = int(os.getenv('WARMUP_BUDGET_WINDOW_SECONDS', 60 * 60))
+    WARMUP_REQUEST_DELAY_SECONDS = float(os.getenv('WARMUP_REQUEST_DELAY_SECONDS', 0.5))
+    # Popularity counts only searches from the last window, kept in buckets that expire
+    WARMUP_POPULARITY_WINDOW_SECONDS = int(os.getenv('WARMUP_POPULARITY_WINDOW_SECONDS', 24 * 60 * 60))
+    WARMUP_POPULARITY_BUCKET_SECONDS = int(os.getenv('WARMUP_POPULARITY_BUCKET_SECONDS', 60 * 60))
+    
     # CORS Configuration
     CORS_ORIGINS = ['http://localhost:3000', 'http://127.0.0.1:3000']
     
+    # Startup - run deferred initialization (Mongo, indexes, HTTP pool) at import
+    WARM_ON_START = os.getenv('WARM_ON_START', 'False') == 'True'
+    
     # Server Configuration
     HOST = '0.0.0.0'
     PORT = 5000
\ No newline at end of file
@@ -10,6 +10,10 @@ class User:
         self.bcrypt = bcrypt
         self.collection = mongo.db.users
     
+    def ensure_indexes(self):
+        self.collection.create_index('email')
+        self.collection.create_index('username_lower')
+    
     def validate_email(self, email):
         email_pattern = re.compile(
             r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
@@ -1,7 +1,10 @@
-from flask import Blueprint, request, jsonify
+from functools import wraps
+from flask import Blueprint, request, jsonify, g
 from flask_cors import cross_origin
 from app.models.user import User
 from app.services.event_service import event_service
+from app.services.token_service import token_service
+from app.services.warmup_service import warmup_service
 
 # Create blueprint
 main_bp = Blueprint('main', __name__)
@@ -12,6 +15,40 @@ user_model = None
 def init_routes(mongo, bcrypt):
     global user_model
     user_model = User(mongo, bcrypt)
+    event_service.init_app(mongo)
+    token_service.init_app(mongo)
+    warmup_service.init_app(mongo)
+
+def token_required(f):
+    """
+    Verify the Bearer token in memory and make sure it belongs to the URL's user_id
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        auth_header = request.headers.get('Authorization', '')
+        if not auth_header.startswith('Bearer '):
+            return jsonify({
+                'success': False,
+                'error': 'Authorization token is required'
+            }), 401
+        
+        payload = token_service.verify_token(auth_header[len('Bearer '):].strip())
+        if payload is None:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid or expired token'
+            }), 401
+        
+        if 'user_id' in kwargs and kwargs['user_id'] != payload['sub']:
+            return jsonify({
+                'success': False,
+                'error': 'Not allowed to access this user'
+            }), 403
+        
+        g.token_payload = payload
+        return f(*args, **kwargs)
+    
+    return decorated
 
 # ============= EVENT ROUTES =============
 
@@ -41,6 +78,7 @@ def search_events():
         result = event_service.search_events(**params)
         
         if result['success']:
+            warmup_service.record_search(params)
             return jsonify(result), 200
         else:
             return jsonify(result), 400
@@ -106,7 +144,8 @@ def register():
             return jsonify({
                 'success': True,
                 'message': message,
-                'user': user_data
+                'user': user_data,
+                'token': token_service.issue_token(user_data['_id'])
             }), 201
         else:
             return jsonify({
@@ -149,7 +188,8 @@ def login():
             return jsonify({
                 'success': True,
                 'message': message,
-                'user': user_data
+                'user': user_data,
+                'token': token_service.issue_token(user_data['_id'])
             }), 200
         else:
             return jsonify({
@@ -164,10 +204,30 @@ def login():
             'error': f'Login failed: {str(e)}'
         }), 500
 
+@main_bp.route('/auth/logout', methods=['POST'])
+@cross_origin()
+@token_required
+def logout():
+    try:
+        token_service.revoke_token(g.token_payload)
+        
+        return jsonify({
+            'success': True,
+            'message': 'Logged out successfully'
+        }), 200
+            
+    except Exception as e:
+        print(f"Logout endpoint error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': f'Logout failed: {str(e)}'
+        }), 500
+
 # ============= USER FAVORITES ROUTES =============
 
 @main_bp.route('/users/<user_id>/favorites', methods=['GET'])
 @cross_origin()
+@token_required
 def get_favorites(user_id):
     try:
         success, message, favorites = user_model.get_user_favorites(user_id)
@@ -192,6 +252,7 @@ def get_favorites(user_id):
 
 @main_bp.route('/users/<user_id>/favorites', methods=['POST'])
 @cross_origin()
+@token_required
 def add_favorite(user_id):
     try:
         data = request.get_json()
@@ -225,6 +286,7 @@ def add_favorite(user_id):
 
 @main_bp.route('/users/<user_id>/favorites/<event_id>', methods=['DELETE'])
 @cross_origin()
+@token_required
 def remove_favorite(user_id, event_id):
     try:
         success, message = user_model.remove_from_favorites(user_id, event_id)
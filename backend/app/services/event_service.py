@@ -1,6 +1,11 @@
-import requests
-from datetime import datetime
+import os
+import time
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from urllib.parse import urlencode
 from app.config import Config
+from app.services.event_stream import CHUNK_SIZE, parse_search_stream
 
 class EventService:
     
@@ -8,61 +13,91 @@ class EventService:
         self.api_key = Config.TICKETMASTER_API_KEY
         self.base_url = f"{Config.TICKETMASTER_BASE_URL}/events.json"
         self.timeout = 10
+        
+        # Search response cache: query key -> (expires_at, result)
+        self.cache_ttl = Config.EVENT_CACHE_TTL_SECONDS
+        self.cache_size = Config.EVENT_CACHE_SIZE
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Cache shared by every worker (Mongo), consulted when the local cache misses
+        self._shared_cache = None
+        
+        # HTTP connection pool, created on first use in each process - a forked
+        # worker must not share the parent's sockets
+        self._session = None
+        self._session_pid = None
+        self._session_lock = threading.Lock()
     
-    def search_events(self, **params):
+    def init_app(self, mongo):
+        self._shared_cache = mongo.db.search_cache
+    
+    def ensure_indexes(self):
+        if self._shared_cache is not None:
+            self._shared_cache.create_index('expires_at', expireAfterSeconds=0)
+    
+    @property
+    def session(self):
+        if self._session is None or self._session_pid != os.getpid():
+            self.warm()
+        return self._session
+    
+    def warm(self):
+        """
+        Create the HTTP session (connection pool) ahead of the first search
+        """
+        with self._session_lock:
+            if self._session is None or self._session_pid != os.getpid():
+                # requests is imported here, not at module level, to keep startup fast
+                import requests
+                self._session = requests.Session()
+                self._session_pid = os.getpid()
+    
+    def search_events(self, refresh=False, **params):
         """
         FIXED: Enhanced event search with better parameter handling
+        refresh=True skips the cache lookup and re-fetches from Ticketmaster
         """
+        import requests
+        from urllib3.exceptions import ReadTimeoutError
+        
         try:
-            # Build query parameters
-            query_params = {'apikey': self.api_key}
-            
-            # Handle search parameters
-            if params.get('keyword'):
-                query_params['keyword'] = params['keyword']
+            query_params = self._build_query_params(params)
+            cache_key = self._cache_key(query_params)
             
-            if params.get('city'):
-                query_params['city'] = params['city']
+            if not refresh:
+                cached = self._get_cached(cache_key)
+                if cached is not None:
+                    return cached
             
-            if params.get('stateCode'):
-                query_params['stateCode'] = params['stateCode']
-            
-            # Handle date formatting
-            if params.get('startDate'):
-                start_date = datetime.fromisoformat(params['startDate'].replace('Z', '+00:00'))
-                query_params['startDateTime'] = start_date.strftime('%Y-%m-%dT%H:%M:%SZ')
-            
-            if params.get('endDate'):
-                end_date = datetime.fromisoformat(params['endDate'].replace('Z', '+00:00'))
-                query_params['endDateTime'] = end_date.strftime('%Y-%m-%dT%H:%M:%SZ')
-            
-            if params.get('segment'):
-                query_params['segmentName'] = params['segment']
-            
-            # Additional useful parameters
-            if params.get('size'):
-                query_params['size'] = min(int(params['size']), 200) 
+            if Config.STREAM_EVENT_PARSING:
+                # Parse and format events straight off the socket
+                with self.session.get(
+                    self.base_url,
+                    params=query_params,
+                    timeout=self.timeout,
+                    stream=True
+                ) as response:
+                    response.raise_for_status()
+                    # iter_content decompresses and turns socket errors into requests exceptions
+                    result = self._stream_events_response(response.iter_content(CHUNK_SIZE))
             else:
-                query_params['size'] = 20  
-            
-            if params.get('page'):
-                query_params['page'] = params['page']
+                # Make API request with timeout
+                response = self.session.get(
+                    self.base_url, 
+                    params=query_params,
+                    timeout=self.timeout
+                )
+                response.raise_for_status()
+                
+                data = response.json()
+                
+                # Process and format response
+                result = self._format_events_response(data)
             
-            # Sort by date
-            query_params['sort'] = 'date,asc'
-            
-            # Make API request with timeout
-            response = requests.get(
-                self.base_url, 
-                params=query_params,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # Process and format response
-            return self._format_events_response(data)
+            if result['success']:
+                self._set_cached(cache_key, result)
+            return result
             
         except requests.exceptions.Timeout:
             return {
@@ -70,6 +105,12 @@ class EventService:
                 'error': 'Request timeout - Ticketmaster API is not responding'
             }
         except requests.exceptions.RequestException as e:
+            # A read timeout while the body is downloading arrives as ConnectionError(ReadTimeoutError)
+            if e.args and isinstance(e.args[0], ReadTimeoutError):
+                return {
+                    'success': False,
+                    'error': 'Request timeout - Ticketmaster API is not responding'
+                }
             return {
                 'success': False,
                 'error': f'API request failed: {str(e)}'
@@ -81,10 +122,111 @@ class EventService:
                 'error': f'Search failed: {str(e)}'
             }
     
+    def is_search_cached(self, **params):
+        try:
+            cache_key = self._cache_key(self._build_query_params(params))
+            return self._get_cached(cache_key) is not None
+        except Exception:
+            return False
+    
+    def _build_query_params(self, params):
+        # Build query parameters
+        query_params = {'apikey': self.api_key}
+        
+        # Handle search parameters
+        if params.get('keyword'):
+            query_params['keyword'] = params['keyword']
+        
+        if params.get('city'):
+            query_params['city'] = params['city']
+        
+        if params.get('stateCode'):
+            query_params['stateCode'] = params['stateCode']
+        
+        # Handle date formatting
+        if params.get('startDate'):
+            start_date = datetime.fromisoformat(params['startDate'].replace('Z', '+00:00'))
+            query_params['startDateTime'] = start_date.strftime('%Y-%m-%dT%H:%M:%SZ')
+        
+        if params.get('endDate'):
+            end_date = datetime.fromisoformat(params['endDate'].replace('Z', '+00:00'))
+            query_params['endDateTime'] = end_date.strftime('%Y-%m-%dT%H:%M:%SZ')
+        
+        if params.get('segment'):
+            query_params['segmentName'] = params['segment']
+        
+        # Additional useful parameters
+        if params.get('size'):
+            query_params['size'] = min(int(params['size']), 200) 
+        else:
+            query_params['size'] = 20  
+        
+        if params.get('page'):
+            query_params['page'] = params['page']
+        
+        # Sort by date
+        query_params['sort'] = 'date,asc'
+        
+        return query_params
+    
+    def _cache_key(self, query_params):
+        return tuple(sorted((k, str(v)) for k, v in query_params.items() if k != 'apikey'))
+    
+    def _get_cached(self, cache_key):
+        with self._cache_lock:
+            entry = self._cache.get(cache_key)
+            if entry is not None:
+                if entry[0] > time.time():
+                    self._cache.move_to_end(cache_key)
+                    return entry[1]
+                del self._cache[cache_key]
+        
+        if self._shared_cache is None:
+            return None
+        
+        try:
+            doc = self._shared_cache.find_one({
+                '_id': urlencode(cache_key),
+                'expires_at': {'$gt': datetime.utcnow()}
+            })
+        except Exception as e:
+            print(f"Shared cache read error: {str(e)}")
+            return None
+        if doc is None:
+            return None
+        
+        # Keep it locally until the shared entry expires
+        expires_at = doc['expires_at'].replace(tzinfo=timezone.utc).timestamp()
+        self._set_local(cache_key, expires_at, doc['result'])
+        return doc['result']
+    
+    def _set_cached(self, cache_key, result):
+        expires_at = time.time() + self.cache_ttl
+        self._set_local(cache_key, expires_at, result)
+        
+        if self._shared_cache is None:
+            return
+        
+        try:
+            self._shared_cache.replace_one(
+                {'_id': urlencode(cache_key)},
+                {'result': result, 'expires_at': datetime.utcfromtimestamp(expires_at)},
+                upsert=True
+            )
+        except Exception as e:
+            print(f"Shared cache write error: {str(e)}")
+    
+    def _set_local(self, cache_key, expires_at, result):
+        with self._cache_lock:
+            self._cache[cache_key] = (expires_at, result)
+            self._cache.move_to_end(cache_key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
     def get_event_by_id(self, event_id):
         try:
             url = f"{Config.TICKETMASTER_BASE_URL}/events/{event_id}.json"
-            response = requests.get(
+            response = self.session.get(
                 url,
                 params={'apikey': self.api_key},
                 timeout=self.timeout
@@ -108,25 +250,39 @@ class EventService:
         try:
             events = []
             
-            if '_embedded' in data and 'events' in data['_embedded']:
-                for event in data['_embedded']['events']:
-                    events.append(self._format_single_event(event))
+            # null counts as a missing key, as in parse_search_stream
+            raw_events = (data.get('_embedded') or {}).get('events') or []
+            if not isinstance(raw_events, list):
+                raise TypeError('_embedded.events is not a list')
+            
+            for event in raw_events:
+                events.append(self._format_single_event(event))
             
             # Pagination info
-            page_info = data.get('page', {})
+            page_info = data.get('page') or {}
+            
+            return self._events_result(events, page_info)
             
+        except Exception as e:
+            print(f"Format error: {str(e)}")
             return {
-                'success': True,
-                'events': events,
-                'pagination': {
-                    'size': page_info.get('size', 20),
-                    'totalElements': page_info.get('totalElements', 0),
-                    'totalPages': page_info.get('totalPages', 0),
-                    'number': page_info.get('number', 0)
-                }
+                'success': False,
+                'error': 'Failed to format response',
+                'events': []
             }
+    
+    def _stream_events_response(self, chunks):
+        """
+        Single-pass version of response.json() + _format_events_response: each
+        event is decoded from the byte chunks and formatted before the next is read
+        """
+        try:
+            events, page_info = parse_search_stream(chunks, self._format_single_event)
+            return self._events_result(events, page_info)
             
-        except Exception as e:
+        # Malformed JSON only - requests exceptions raised while reading chunks
+        # propagate to search_events, which maps them to timeout/request errors
+        except ValueError as e:
             print(f"Format error: {str(e)}")
             return {
                 'success': False,
@@ -134,6 +290,18 @@ class EventService:
                 'events': []
             }
     
+    def _events_result(self, events, page_info):
+        return {
+            'success': True,
+            'events': events,
+            'pagination': {
+                'size': page_info.get('size', 20),
+                'totalElements': page_info.get('totalElements', 0),
+                'totalPages': page_info.get('totalPages', 0),
+                'number': page_info.get('number', 0)
+            }
+        }
+    
     def _format_single_event(self, event):
         try:
             # Extract venue information
@@ -163,16 +331,19 @@ class EventService:
             images = event.get('images', [])
             image_url = None
             if images:
-                # Sort by width
-                sorted_images = sorted(images, key=lambda x: x.get('width', 0), reverse=True)
-                image_url = sorted_images[0].get('url')
+                # Widest image - one linear pass instead of sorting the list
+                image_url = max(images, key=lambda x: x.get('width', 0)).get('url')
             
             # Format date and time
-            date_info = event.get('dates', {}).get('start', {})
+            dates = event.get('dates', {})
+            date_info = dates.get('start', {})
             event_date = date_info.get('dateTime', '')
             local_date = date_info.get('localDate', '')
             local_time = date_info.get('localTime', '')
             
+            # Primary classification, looked up once
+            classification = event.get('classifications', [{}])[0]
+            
             return {
                 'id': event.get('id'),
                 'name': event.get('name'),
@@ -185,10 +356,10 @@ class EventService:
                 'localTime': local_time,
                 'venue': venue,
                 'priceRanges': price_ranges,
-                'segment': event.get('classifications', [{}])[0].get('segment', {}).get('name'),
-                'genre': event.get('classifications', [{}])[0].get('genre', {}).get('name'),
-                'subGenre': event.get('classifications', [{}])[0].get('subGenre', {}).get('name'),
-                'status': event.get('dates', {}).get('status', {}).get('code', 'onsale'),
+                'segment': classification.get('segment', {}).get('name'),
+                'genre': classification.get('genre', {}).get('name'),
+                'subGenre': classification.get('subGenre', {}).get('name'),
+                'status': dates.get('status', {}).get('code', 'onsale'),
                 'seatmap': event.get('seatmap', {}).get('staticUrl')  
             }
             
@@ -0,0 +1,156 @@
+import re
+import json
+import codecs
+
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r'[ \t\n\r]*')
+
+class _StreamBuffer:
+    """
+    Text decoded from an iterable of byte chunks, holding only what has not been consumed yet
+    """
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        if self.eof:
+            raise ValueError('Unexpected end of JSON stream')
+
+        # Empty chunks are allowed mid-stream; only exhaustion ends it
+        chunk = next(self.chunks, None)
+        while chunk == b'':
+            chunk = next(self.chunks, None)
+
+        self.eof = chunk is None
+        self.text = self.text[self.pos:] + self.utf8.decode(chunk or b'', final=self.eof)
+        self.pos = 0
+
+    def peek(self):
+        """
+        Skip whitespace and return the next character without consuming it
+        """
+        while True:
+            self.pos = _whitespace.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            self.fill()
+
+    def expect_end(self):
+        while True:
+            self.pos = _whitespace.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                raise ValueError('Unexpected data after JSON document')
+            if self.eof:
+                return
+            self.fill()
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' in JSON stream")
+        self.pos += 1
+
+    def value(self):
+        """
+        Decode one complete JSON value with the C scanner, reading more as needed
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self.fill()
+                continue
+
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.text) and not self.eof:
+                self.fill()
+                continue
+
+            self.pos = end
+            return value
+
+def _object_keys(buf):
+    # The caller consumes each key's value before asking for the next key
+    buf.expect('{')
+    if buf.peek() == '}':
+        buf.pos += 1
+        return
+
+    while True:
+        # raw_decode accepts any value here, JSON only allows strings
+        if buf.peek() != '"':
+            raise ValueError('Expected a string key in JSON stream')
+        key = buf.value()
+        buf.expect(':')
+        yield key
+
+        if buf.peek() == ',':
+            buf.pos += 1
+            continue
+        buf.expect('}')
+        return
+
+def _array_items(buf):
+    buf.expect('[')
+    if buf.peek() == ']':
+        buf.pos += 1
+        return
+
+    while True:
+        yield buf.value()
+
+        if buf.peek() == ',':
+            buf.pos += 1
+            continue
+        buf.expect(']')
+        return
+
+def _skip_empty(buf, name):
+    # null (or any empty value) counts as a missing key, like `data.get(name) or {}`
+    if buf.value():
+        raise ValueError(f"Unexpected type for '{name}' in JSON stream")
+
+def parse_search_stream(chunks, format_event):
+    """
+    Parse a Discovery search response from an iterable of byte chunks
+    (e.g. response.iter_content(CHUNK_SIZE)) in one pass.
+
+    Each `_embedded.events` item is passed to format_event as soon as it is
+    complete, so the raw event objects never exist all at once.
+    Returns (formatted events, page info)
+    """
+    buf = _StreamBuffer(chunks)
+    events = []
+    page_info = {}
+
+    for key in _object_keys(buf):
+        if key == '_embedded':
+            if buf.peek() != '{':
+                _skip_empty(buf, key)
+                continue
+            for embedded_key in _object_keys(buf):
+                if embedded_key != 'events':
+                    buf.value()
+                elif buf.peek() != '[':
+                    _skip_empty(buf, embedded_key)
+                else:
+                    for event in _array_items(buf):
+                        events.append(format_event(event))
+        elif key == 'page':
+            page_info = buf.value() or {}
+            if not isinstance(page_info, dict):
+                raise ValueError("Expected an object for 'page' in JSON stream")
+        else:
+            buf.value()
+
+    buf.expect_end()
+    return events, page_info
@@ -0,0 +1,177 @@
+import hmac
+import json
+import time
+import uuid
+import base64
+import hashlib
+import threading
+from datetime import datetime
+from collections import OrderedDict
+from app.config import Config
+
+class TokenService:
+
+    def __init__(self):
+        self.expiry_seconds = Config.TOKEN_EXPIRY_SECONDS
+        self.cache_size = Config.TOKEN_CACHE_SIZE
+        self.denylist_refresh_seconds = Config.TOKEN_DENYLIST_REFRESH_SECONDS
+
+        # Signing key first, then any rotated-out keys still accepted for verification
+        self._keys = OrderedDict()
+        for secret in [Config.SECRET_KEY] + Config.PREVIOUS_SECRET_KEYS:
+            key = secret.encode('utf-8')
+            self._keys[self._key_id(key)] = key
+        self._signing_kid = next(iter(self._keys))
+
+        # LRU of recently verified tokens -> payload
+        self._verified = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Revoked token ids, refreshed from Mongo in the background so that
+        # verification never waits on the database
+        self._collection = None
+        self._denylist = set()
+        # Revoked by this process: jti -> exp, kept until the token expires so a
+        # refresh that raced with the revocation cannot drop it
+        self._revoked_here = {}
+        self._thread = None
+
+    def init_app(self, mongo):
+        self._collection = mongo.db.revoked_tokens
+
+    def ensure_indexes(self):
+        if self._collection is not None:
+            self._collection.create_index('jti')
+            # Mongo purges entries once the token they revoke has expired
+            self._collection.create_index('expires_at', expireAfterSeconds=0)
+
+    def start(self):
+        """
+        Load the denylist now, then reload it every `denylist_refresh_seconds` in the background
+        """
+        # A thread inherited through fork is no longer alive in the child
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._thread = threading.Thread(target=self._refresh_forever, name='token-denylist', daemon=True)
+        self._thread.start()
+
+    def issue_token(self, user_id):
+        now = int(time.time())
+        payload = {
+            'sub': user_id,
+            'iat': now,
+            'exp': now + self.expiry_seconds,
+            'jti': uuid.uuid4().hex,
+            'kid': self._signing_kid
+        }
+        body = self._encode(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+        return f"{body}.{self._sign(self._keys[self._signing_kid], body)}"
+
+    def verify_token(self, token):
+        """
+        Return the token payload, or None if the token is invalid, expired or revoked
+        """
+        now = time.time()
+
+        with self._lock:
+            payload = self._verified.get(token)
+            if payload is not None:
+                self._verified.move_to_end(token)
+
+        if payload is None:
+            payload = self._decode_and_check(token)
+            if payload is None:
+                return None
+            with self._lock:
+                self._verified[token] = payload
+                if len(self._verified) > self.cache_size:
+                    self._verified.popitem(last=False)
+
+        if payload['exp'] <= now or payload['jti'] in self._denylist:
+            with self._lock:
+                self._verified.pop(token, None)
+            return None
+
+        return payload
+
+    def revoke_token(self, payload):
+        with self._lock:
+            self._revoked_here[payload['jti']] = payload['exp']
+            self._denylist = self._denylist | {payload['jti']}
+
+        if self._collection is not None:
+            try:
+                # Keep the entry only as long as the token could still be valid
+                self._collection.update_one(
+                    {'jti': payload['jti']},
+                    {'$set': {
+                        'jti': payload['jti'],
+                        'exp': payload['exp'],
+                        'expires_at': datetime.utcfromtimestamp(payload['exp'])
+                    }},
+                    upsert=True
+                )
+            except Exception as e:
+                print(f"Revoke token error: {str(e)}")
+
+    def refresh_denylist(self):
+        if self._collection is None:
+            return
+
+        try:
+            now = int(time.time())
+            # The TTL monitor runs about once a minute, so skip expired entries it has not removed yet
+            cursor = self._collection.find({'exp': {'$gt': now}}, {'jti': 1})
+            loaded = {doc['jti'] for doc in cursor}
+        except Exception as e:
+            print(f"Denylist refresh error: {str(e)}")
+            return
+
+        with self._lock:
+            self._revoked_here = {jti: exp for jti, exp in self._revoked_here.items() if exp > now}
+            self._denylist = loaded | set(self._revoked_here)
+
+    def _refresh_forever(self):
+        while True:
+            self.refresh_denylist()
+            time.sleep(self.denylist_refresh_seconds)
+
+    def _decode_and_check(self, token):
+        try:
+            body, signature = token.split('.')
+            payload = json.loads(self._decode(body))
+
+            key = self._keys.get(payload.get('kid'))
+            if key is None:
+                return None
+
+            if not hmac.compare_digest(signature, self._sign(key, body)):
+                return None
+
+            if not all(k in payload for k in ('sub', 'exp', 'jti')):
+                return None
+
+            return payload
+
+        except (ValueError, TypeError, AttributeError):
+            return None
+
+    @staticmethod
+    def _key_id(key):
+        return hashlib.sha256(key).hexdigest()[:8]
+
+    @classmethod
+    def _sign(cls, key, body):
+        return cls._encode(hmac.new(key, body.encode('ascii'), hashlib.sha256).digest())
+
+    @staticmethod
+    def _encode(raw):
+        return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+    @staticmethod
+    def _decode(text):
+        return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+# Create singleton instance
+token_service = TokenService()
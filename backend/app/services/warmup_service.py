@@ -0,0 +1,290 @@
+import json
+import time
+import threading
+from datetime import datetime, timedelta, timezone
+from pymongo.errors import DuplicateKeyError
+from app.config import Config
+from app.services.event_service import event_service
+
+# Search parameters that identify a distinct cached response
+SEARCH_PARAM_KEYS = ['keyword', 'city', 'stateCode', 'startDate', 'endDate', 'segment', 'size', 'page']
+
+class WarmupService:
+
+    def __init__(self):
+        self.top_n = Config.WARMUP_TOP_N
+        self.interval = Config.WARMUP_INTERVAL_SECONDS
+        self.upstream_budget = Config.WARMUP_UPSTREAM_BUDGET
+        self.budget_window = Config.WARMUP_BUDGET_WINDOW_SECONDS
+        self.request_delay = Config.WARMUP_REQUEST_DELAY_SECONDS
+        self.bucket_seconds = Config.WARMUP_POPULARITY_BUCKET_SECONDS
+        self.window_buckets = max(1, Config.WARMUP_POPULARITY_WINDOW_SECONDS // self.bucket_seconds)
+
+        # Warmed entries are only re-fetched once expired, so they must outlive a run interval
+        if Config.WARMUP_ENABLED and Config.EVENT_CACHE_TTL_SECONDS <= self.interval:
+            raise ValueError(
+                'EVENT_CACHE_TTL_SECONDS must be greater than WARMUP_INTERVAL_SECONDS'
+            )
+
+        # Track a long tail beyond top_n so new searches can climb the ranking
+        self.max_tracked = self.top_n * 20
+
+        # Hits recorded since the last flush: normalized key -> [params, hits]
+        self._pending = {}
+        # Flushed hits when there is no database: (key, bucket) -> [params, hits]
+        self._recent = {}
+        self._lock = threading.Lock()
+        self._collection = None
+        self._budget_collection = None
+        self._thread = None
+
+        # Upstream calls in the current budget window, used when there is no database
+        self._window_id = None
+        self._window_calls = 0
+
+        self._progress = {
+            'state': 'idle',
+            'total': 0,
+            'warmed': 0,
+            'skipped': 0,
+            'failed': 0,
+            'upstream_calls': 0,
+            'budget_exhausted': False,
+            'last_started': None,
+            'last_finished': None
+        }
+
+    def init_app(self, mongo):
+        self._collection = mongo.db.search_hits
+        self._budget_collection = mongo.db.warmup_budget
+
+    def ensure_indexes(self):
+        if self._collection is not None:
+            self._collection.create_index([('key', 1), ('bucket', 1)], unique=True)
+            self._collection.create_index('bucket')
+            self._collection.create_index('expires_at', expireAfterSeconds=0)
+        if self._budget_collection is not None:
+            self._budget_collection.create_index('expires_at', expireAfterSeconds=0)
+
+    def start(self, before_first_run=None):
+        """
+        Warm the cache once now, then again every `interval` seconds in the background.
+        before_first_run is called on the warm-up thread, e.g. to connect to Mongo
+        """
+        # A thread inherited through fork is no longer alive in the child
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._thread = threading.Thread(
+            target=self._run_forever,
+            args=(before_first_run,),
+            name='cache-warmup',
+            daemon=True
+        )
+        self._thread.start()
+
+    def record_search(self, params):
+        params = self.normalize_params(params)
+        if not params:
+            return
+
+        key = json.dumps(params, sort_keys=True)
+        with self._lock:
+            if key in self._pending:
+                self._pending[key][1] += 1
+            elif len(self._pending) < self.max_tracked:
+                self._pending[key] = [params, 1]
+
+    @staticmethod
+    def normalize_params(params):
+        normalized = {}
+        for key in SEARCH_PARAM_KEYS:
+            value = params.get(key)
+            if value is None:
+                continue
+            value = str(value).strip()
+            if value:
+                normalized[key] = value
+
+        # Defaults the search route fills in on its own
+        if normalized.get('size') == '20':
+            del normalized['size']
+        if normalized.get('page') == '0':
+            del normalized['page']
+
+        return normalized
+
+    def status(self):
+        with self._lock:
+            return dict(self._progress)
+
+    def warm_up(self):
+        self.flush()
+        popular = [params for params in self.get_popular_searches() if not self._has_ended(params)]
+
+        self._update_progress(
+            state='running',
+            total=len(popular),
+            warmed=0,
+            skipped=0,
+            failed=0,
+            upstream_calls=0,
+            budget_exhausted=False,
+            last_started=datetime.utcnow().isoformat()
+        )
+
+        for params in popular:
+            # Only re-fetch entries that have expired
+            if event_service.is_search_cached(**params):
+                self._bump('skipped')
+                continue
+
+            if not self._reserve_upstream_call():
+                self._update_progress(budget_exhausted=True)
+                break
+
+            self._bump('upstream_calls')
+            result = event_service.search_events(refresh=True, **params)
+            self._bump('warmed' if result.get('success') else 'failed')
+
+            # Stay in the background so live requests get the upstream first
+            time.sleep(self.request_delay)
+
+        self._update_progress(state='idle', last_finished=datetime.utcnow().isoformat())
+
+    def flush(self):
+        """
+        Add the pending hits to the current time bucket
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        bucket = self._current_bucket()
+
+        if self._collection is None:
+            # No database - keep the buckets in memory, dropping those outside the window
+            oldest = bucket - self.window_buckets + 1
+            with self._lock:
+                for key, (params, hits) in pending.items():
+                    self._recent.setdefault((key, bucket), [params, 0])[1] += hits
+                self._recent = {
+                    entry_key: entry for entry_key, entry in self._recent.items() if entry_key[1] >= oldest
+                }
+            return
+
+        # The TTL index drops a bucket once it has left the window
+        expires_at = datetime.utcfromtimestamp((bucket + 1 + self.window_buckets) * self.bucket_seconds)
+        try:
+            for key, (params, hits) in pending.items():
+                self._collection.update_one(
+                    {'key': key, 'bucket': bucket},
+                    {
+                        '$inc': {'hits': hits},
+                        '$set': {'params': params, 'expires_at': expires_at}
+                    },
+                    upsert=True
+                )
+        except Exception as e:
+            print(f"Warm-up flush error: {str(e)}")
+
+    def get_popular_searches(self):
+        """
+        Top searches by hits within the popularity window, so the ranking follows recent traffic
+        """
+        oldest = self._current_bucket() - self.window_buckets + 1
+
+        if self._collection is None:
+            totals = {}
+            with self._lock:
+                for (key, bucket), (params, hits) in self._recent.items():
+                    if bucket >= oldest:
+                        totals.setdefault(key, [params, 0])[1] += hits
+            ranked = sorted(totals.values(), key=lambda item: item[1], reverse=True)
+            return [params for params, _ in ranked[:self.top_n]]
+
+        try:
+            cursor = self._collection.aggregate([
+                {'$match': {'bucket': {'$gte': oldest}}},
+                {'$group': {'_id': '$key', 'hits': {'$sum': '$hits'}, 'params': {'$first': '$params'}}},
+                {'$sort': {'hits': -1, '_id': 1}},
+                {'$limit': self.top_n}
+            ])
+            return [doc['params'] for doc in cursor]
+        except Exception as e:
+            print(f"Warm-up load error: {str(e)}")
+            return []
+
+    def _current_bucket(self):
+        return int(time.time() // self.bucket_seconds)
+
+    @staticmethod
+    def _has_ended(params):
+        """
+        True for searches whose endDate has passed - replaying them only refreshes empty pages
+        """
+        if not params.get('endDate'):
+            return False
+        try:
+            end_date = datetime.fromisoformat(params['endDate'].replace('Z', '+00:00'))
+        except ValueError:
+            return False
+        if end_date.tzinfo is not None:
+            end_date = end_date.astimezone(timezone.utc).replace(tzinfo=None)
+        return end_date < datetime.utcnow()
+
+    def _reserve_upstream_call(self):
+        """
+        Take one call from the budget of the current window, shared by every
+        worker through Mongo; False once the window's budget is spent
+        """
+        window_id = int(time.time() // self.budget_window)
+
+        if self._budget_collection is None:
+            with self._lock:
+                if window_id != self._window_id:
+                    self._window_id, self._window_calls = window_id, 0
+                if self._window_calls >= self.upstream_budget:
+                    return False
+                self._window_calls += 1
+                return True
+
+        expires_at = datetime.utcfromtimestamp((window_id + 1) * self.budget_window) + timedelta(hours=1)
+        try:
+            # Matches only while calls < budget; once spent, the upsert collides on _id
+            self._budget_collection.update_one(
+                {'_id': window_id, 'calls': {'$lt': self.upstream_budget}},
+                {'$inc': {'calls': 1}, '$setOnInsert': {'expires_at': expires_at}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+        except Exception as e:
+            print(f"Warm-up budget error: {str(e)}")
+            return False
+
+    def _run_forever(self, before_first_run=None):
+        if before_first_run is not None:
+            try:
+                before_first_run()
+            except Exception as e:
+                print(f"Warm-up init error: {str(e)}")
+
+        while True:
+            try:
+                self.warm_up()
+            except Exception as e:
+                print(f"Warm-up error: {str(e)}")
+                self._update_progress(state='error', last_finished=datetime.utcnow().isoformat())
+            time.sleep(self.interval)
+
+    def _update_progress(self, **fields):
+        with self._lock:
+            self._progress.update(fields)
+
+    def _bump(self, field):
+        with self._lock:
+            self._progress[field] += 1
+
+# Create singleton instance
+warmup_service = WarmupService()
@@ -0,0 +1,26 @@
+import time
+import threading
+
+# Reference point for every startup timing: when the app package was first imported
+IMPORTED_AT = time.perf_counter()
+
+_lock = threading.Lock()
+_timings = {}
+
+def mark(name):
+    """
+    Record how long after import a startup milestone was reached (first call wins)
+    """
+    with _lock:
+        if name not in _timings:
+            _timings[name] = round((time.perf_counter() - IMPORTED_AT) * 1000, 2)
+
+def mark_response(status_code):
+    if 'first_request_ms' not in _timings:
+        mark('first_request_ms')
+    if status_code < 400 and 'first_successful_request_ms' not in _timings:
+        mark('first_successful_request_ms')
+
+def report():
+    with _lock:
+        return dict(_timings)
@@ -0,0 +1,169 @@
+"""
+Micro-benchmark: buffered vs streaming parsing of Ticketmaster search payloads.
+
+Compares response.json() + _format_events_response (buffered) against
+_stream_events_response (streaming) on the same bytes, reporting CPU time
+and tracemalloc peak memory per page.
+
+    python bench_event_parsing.py [--payload recorded.json] [--events 200] [--runs 20]
+
+Without --payload a Discovery-shaped page is generated; pass a saved
+/discovery/v2/events.json response to benchmark real data.
+"""
+import json
+import time
+import argparse
+import tracemalloc
+from app.services.event_service import event_service
+from app.services.event_stream import CHUNK_SIZE
+
+def build_payload(event_count):
+    """
+    Generate a search page shaped like a Discovery API response
+    """
+    events = []
+    for i in range(event_count):
+        events.append({
+            'name': f'Event {i}',
+            'type': 'event',
+            'id': f'vvG1zZ9{i:06d}',
+            'test': False,
+            'url': f'https://www.ticketmaster.com/event/{i:016X}',
+            'locale': 'en-us',
+            'info': 'Doors open one hour before the show. ' * 5,
+            'pleaseNote': 'No re-entry. ' * 5,
+            'images': [
+                {
+                    'ratio': ratio,
+                    'url': f'https://s1.ticketm.net/dam/a/{i}/{ratio}_{width}x{width // 2}.jpg',
+                    'width': width,
+                    'height': width // 2,
+                    'fallback': False
+                }
+                for ratio, width in [
+                    ('16_9', 205), ('3_2', 640), ('16_9', 1024), ('4_3', 305), ('16_9', 2048),
+                    ('3_2', 3048), ('16_9', 640), ('16_9', 1136), ('3_2', 1024), ('4_3', 100)
+                ]
+            ],
+            'sales': {
+                'public': {
+                    'startDateTime': '2026-01-10T15:00:00Z',
+                    'startTBD': False,
+                    'endDateTime': '2026-11-02T00:00:00Z'
+                },
+                'presales': [
+                    {'startDateTime': '2026-01-08T15:00:00Z', 'endDateTime': '2026-01-09T03:00:00Z', 'name': 'Presale'}
+                ]
+            },
+            'dates': {
+                'start': {
+                    'localDate': '2026-11-01',
+                    'localTime': '19:30:00',
+                    'dateTime': '2026-11-02T00:30:00Z',
+                    'dateTBD': False,
+                    'timeTBA': False
+                },
+                'timezone': 'America/New_York',
+                'status': {'code': 'onsale'},
+                'spanMultipleDays': False
+            },
+            'classifications': [{
+                'primary': True,
+                'segment': {'id': 'KZFzniwnSyZfZ7v7nJ', 'name': 'Music'},
+                'genre': {'id': 'KnvZfZ7vAeA', 'name': 'Rock'},
+                'subGenre': {'id': 'KZazBEonSMnZfZ7v6F1', 'name': 'Pop'},
+                'family': False
+            }],
+            'priceRanges': [
+                {'type': 'standard', 'currency': 'USD', 'min': 49.5, 'max': 199.5},
+                {'type': 'standard including fees', 'currency': 'USD', 'min': 61.25, 'max': 240.1}
+            ],
+            'seatmap': {'staticUrl': f'https://maps.ticketmaster.com/maps/geometry/3/event/{i}/staticImage'},
+            '_links': {
+                'self': {'href': f'/discovery/v2/events/vvG1zZ9{i:06d}?locale=en-us'},
+                'attractions': [{'href': '/discovery/v2/attractions/K8vZ917Gku7?locale=en-us'}],
+                'venues': [{'href': '/discovery/v2/venues/KovZpZAEdFtJ?locale=en-us'}]
+            },
+            '_embedded': {
+                'venues': [{
+                    'name': 'Madison Square Garden',
+                    'type': 'venue',
+                    'id': 'KovZpZAEdFtJ',
+                    'url': 'https://www.ticketmaster.com/madison-square-garden-tickets-new-york/venue/483329',
+                    'postalCode': '10001',
+                    'timezone': 'America/New_York',
+                    'city': {'name': 'New York'},
+                    'state': {'name': 'New York', 'stateCode': 'NY'},
+                    'country': {'name': 'United States Of America', 'countryCode': 'US'},
+                    'address': {'line1': '7th Ave & 32nd Street'},
+                    'location': {'longitude': '-73.99160060', 'latitude': '40.75050060'},
+                    'boxOfficeInfo': {'openHoursDetail': 'Monday - Saturday 10:00am - 6:00pm. ' * 4},
+                    'generalInfo': {'generalRule': 'No cameras or recording devices. ' * 6}
+                }],
+                'attractions': [{
+                    'name': f'Artist {i}',
+                    'type': 'attraction',
+                    'id': 'K8vZ917Gku7',
+                    'url': 'https://www.ticketmaster.com/artist/1234',
+                    'images': [{'ratio': '16_9', 'url': 'https://s1.ticketm.net/dam/a/artist.jpg', 'width': 1024, 'height': 576}]
+                }]
+            }
+        })
+
+    return {
+        '_embedded': {'events': events},
+        '_links': {'self': {'href': '/discovery/v2/events.json?size=200'}},
+        'page': {'size': event_count, 'totalElements': event_count * 5, 'totalPages': 5, 'number': 0}
+    }
+
+def buffered(raw):
+    return event_service._format_events_response(json.loads(raw))
+
+def streaming(raw):
+    chunks = (raw[i:i + CHUNK_SIZE] for i in range(0, len(raw), CHUNK_SIZE))
+    return event_service._stream_events_response(chunks)
+
+def measure(fn, raw, runs):
+    # CPU time, averaged over runs
+    start = time.process_time()
+    for _ in range(runs):
+        fn(raw)
+    cpu_ms = (time.process_time() - start) * 1000 / runs
+
+    # Peak memory of a single run
+    tracemalloc.start()
+    fn(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return cpu_ms, peak / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Ticketmaster payload parsing')
+    parser.add_argument('--payload', help='recorded Discovery search response (JSON file)')
+    parser.add_argument('--events', type=int, default=200, help='events per generated page')
+    parser.add_argument('--runs', type=int, default=20, help='runs per path for CPU timing')
+    args = parser.parse_args()
+
+    if args.payload:
+        with open(args.payload, 'rb') as f:
+            raw = f.read()
+    else:
+        raw = json.dumps(build_payload(args.events)).encode('utf-8')
+
+    if buffered(raw) != streaming(raw):
+        raise SystemExit('Streaming and buffered paths produced different results')
+
+    results = {name: measure(fn, raw, args.runs) for name, fn in [('buffered', buffered), ('streaming', streaming)]}
+
+    print(f"Payload: {len(raw) / 1024:.0f} KiB, {args.runs} runs")
+    print(f"{'path':<10} {'cpu ms':>9} {'peak KiB':>10}")
+    for name, (cpu_ms, peak_kib) in results.items():
+        print(f"{name:<10} {cpu_ms:>9.2f} {peak_kib:>10.0f}")
+
+    (old_cpu, old_peak), (new_cpu, new_peak) = results['buffered'], results['streaming']
+    print(f"{'delta':<10} {new_cpu - old_cpu:>+9.2f} {new_peak - old_peak:>+10.0f}"
+          f"  ({(new_cpu / old_cpu - 1) * 100:+.0f}% cpu, {(new_peak / old_peak - 1) * 100:+.0f}% peak)")
+
+if __name__ == '__main__':
+    main()
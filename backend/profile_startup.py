@@ -0,0 +1,98 @@
+"""
+Startup profiling report.
+
+Imports run.py in a fresh interpreter with `-X importtime`, sends a request
+to /health, and prints the slowest module imports plus the startup milestones
+recorded by app.startup (app created, backend ready, first successful request).
+
+    python profile_startup.py [--top 20] [--json]
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+CHILD_CODE = """
+import json, time
+started = time.perf_counter()
+from run import app
+imported = time.perf_counter()
+client = app.test_client()
+first = client.get('/health')
+# Milestones are recorded after a response is sent, so read them from a second request
+report = client.get('/health').get_json()['startup']
+print(json.dumps({
+    'import_run_ms': round((imported - started) * 1000, 2),
+    'first_request_status': first.status_code,
+    'startup': report
+}))
+"""
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output into {module: (self_us, cumulative_us)}
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            modules[name.strip()] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            # Header line
+            continue
+    return modules
+
+def run_profile():
+    env = dict(os.environ)
+    # Never start background work or touch Mongo while profiling
+    env.setdefault('WARMUP_ENABLED', 'False')
+    env.setdefault('WARM_ON_START', 'False')
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD_CODE],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Profiling run failed:\n{result.stderr[-2000:]}")
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report['imports'] = parse_importtime(result.stderr)
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description='Event Hub startup profiling report')
+    parser.add_argument('--top', type=int, default=20, help='number of modules to list')
+    parser.add_argument('--json', action='store_true', help='print the raw report as JSON')
+    args = parser.parse_args()
+
+    report = run_profile()
+    ranked = sorted(report['imports'].items(), key=lambda item: item[1][1], reverse=True)
+
+    if args.json:
+        report['imports'] = [
+            {'module': name, 'self_ms': self_us / 1000, 'cumulative_ms': cumulative_us / 1000}
+            for name, (self_us, cumulative_us) in ranked[:args.top]
+        ]
+        print(json.dumps(report, indent=2))
+        return
+
+    print("========================================")
+    print("Event Hub Startup Profile")
+    print("========================================")
+    print(f"Import run.py: {report['import_run_ms']} ms")
+    for name, value in report['startup'].items():
+        print(f"{name}: {value}")
+    print(f"First request status: {report['first_request_status']}")
+    print("----------------------------------------")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, (self_us, cumulative_us) in ranked[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,17 @@
-from app import create_app, mongo, bcrypt
+import os
+from app import create_app, warm_app
 from app.config import Config
-from app.routes.routes import init_routes
 
-# Create and configure the Flask app
+# Create and configure the Flask app - Mongo, indexes and the HTTP pool are
+# initialized on the first request, so this module is safe to import before forking
 app = create_app()
 
-# Initialize routes with database connections
-with app.app_context():
-    init_routes(mongo, bcrypt)
+# Warm eagerly when asked to, or when serving directly with `python run.py`
+# (there, in debug mode, only the reloader's child process serves requests)
+if Config.WARM_ON_START:
+    warm_app(app)
+elif __name__ == '__main__' and (not Config.DEBUG or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'):
+    warm_app(app)
 
 if __name__ == '__main__':
     # Run with proper configuration
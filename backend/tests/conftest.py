@@ -0,0 +1,21 @@
+import os
+import pytest
+from app import create_app
+from app.config import Config
+
+@pytest.fixture(autouse=True)
+def no_warmup(monkeypatch):
+    # create_app would start the warm-up thread against Mongo and Ticketmaster
+    monkeypatch.setattr(Config, 'WARMUP_ENABLED', False)
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    # Skip the lazy Mongo wiring - tests stub the models they need
+    app.extensions['event_hub_pid'] = os.getpid()
+    return app
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
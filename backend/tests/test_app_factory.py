@@ -0,0 +1,67 @@
+import importlib
+import sys
+import app as app_module
+from app import mongo
+from app.config import Config
+from app.routes import routes
+from app.services.event_service import event_service
+from app.services.token_service import token_service
+from app.services.warmup_service import warmup_service
+
+def stub_backend(monkeypatch):
+    calls = []
+    monkeypatch.setattr(mongo, 'init_app', lambda app: calls.append('mongo'))
+    monkeypatch.setattr(routes, 'init_routes', lambda mongo, bcrypt: None)
+    monkeypatch.setattr(token_service, 'start', lambda: calls.append('token-thread'))
+    monkeypatch.setattr(app_module, 'ensure_indexes', lambda: calls.append('indexes'))
+    return calls
+
+def test_create_app_defers_backend():
+    app = app_module.create_app()
+    assert 'event_hub_pid' not in app.extensions
+
+def test_create_app_starts_warmup(monkeypatch):
+    started = []
+    monkeypatch.setattr(Config, 'WARMUP_ENABLED', True)
+    monkeypatch.setattr(warmup_service, 'start', lambda before_first_run: started.append(before_first_run))
+    monkeypatch.setattr(app_module.os, 'register_at_fork', lambda after_in_child: None)
+
+    app = app_module.create_app()
+
+    # Started without a request, and without touching Mongo until its thread runs
+    assert len(started) == 1
+    assert 'event_hub_pid' not in app.extensions
+
+def test_warm_app_checks_indexes_once(monkeypatch):
+    calls = stub_backend(monkeypatch)
+    monkeypatch.setattr(event_service, '_session', None)
+
+    app_module.warm_app(app_module.create_app())
+
+    assert calls == ['mongo', 'token-thread', 'indexes']
+    assert event_service._session is not None
+
+def test_forked_worker_initializes_again(monkeypatch):
+    calls = stub_backend(monkeypatch)
+    app = app_module.create_app()
+
+    app_module.init_backend(app, check_indexes_in_background=False)
+    app_module.init_backend(app, check_indexes_in_background=False)
+    assert calls == ['mongo', 'token-thread']
+
+    # Same app object in a child process, as after gunicorn --preload forks
+    monkeypatch.setattr(app_module.os, 'getpid', lambda: -1)
+    app_module.init_backend(app, check_indexes_in_background=False)
+    assert calls == ['mongo', 'token-thread'] * 2
+
+def test_warm_on_start_ignores_reloader_guard(monkeypatch):
+    warmed = []
+    monkeypatch.setattr(Config, 'WARM_ON_START', True)
+    monkeypatch.setattr(Config, 'DEBUG', True)
+    monkeypatch.delenv('WERKZEUG_RUN_MAIN', raising=False)
+    monkeypatch.setattr(app_module, 'warm_app', lambda app: warmed.append(app))
+    monkeypatch.delitem(sys.modules, 'run', raising=False)
+
+    run = importlib.import_module('run')
+
+    assert warmed == [run.app]
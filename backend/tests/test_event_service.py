@@ -0,0 +1,119 @@
+import os
+import json
+import pytest
+import requests
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+from app.config import Config
+from app.services.event_service import EventService
+
+class FakeResponse:
+
+    def __init__(self, body=b'', error=None):
+        self.body = body
+        self.error = error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        yield self.body[:10]
+        if self.error:
+            raise self.error
+        yield self.body[10:]
+
+class FakeSession:
+
+    def __init__(self, response):
+        self.response = response
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        return self.response
+
+class FakeCacheCollection:
+
+    def __init__(self):
+        self.docs = {}
+
+    def find_one(self, query):
+        doc = self.docs.get(query['_id'])
+        if doc is not None and doc['expires_at'] > query['expires_at']['$gt']:
+            return doc
+        return None
+
+    def replace_one(self, query, doc, upsert=False):
+        self.docs[query['_id']] = dict(doc, _id=query['_id'])
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(Config, 'STREAM_EVENT_PARSING', True)
+    return EventService()
+
+def search(service, response):
+    service._session, service._session_pid = FakeSession(response), os.getpid()
+    return service.search_events(keyword='rock')
+
+def test_streamed_search_formats_events(service):
+    body = json.dumps({
+        '_embedded': {'events': [{'id': '1', 'name': 'Show', 'images': [
+            {'url': 'small', 'width': 100}, {'url': 'wide', 'width': 2048}, {'url': 'mid', 'width': 640}
+        ]}]},
+        'page': {'size': 1, 'totalElements': 1, 'totalPages': 1, 'number': 0}
+    }).encode('utf-8')
+
+    result = search(service, FakeResponse(body))
+
+    assert result['success']
+    assert result['events'][0]['image'] == 'wide'
+    assert result['pagination']['totalElements'] == 1
+
+def test_read_timeout_while_streaming_is_a_timeout(service):
+    error = requests.exceptions.ConnectionError(ReadTimeoutError(None, None, 'Read timed out.'))
+    result = search(service, FakeResponse(b'{"_embedded": {"events": []}}', error))
+    assert result['error'] == 'Request timeout - Ticketmaster API is not responding'
+
+def test_broken_connection_while_streaming_is_a_request_error(service):
+    error = requests.exceptions.ChunkedEncodingError(ProtocolError('Connection broken'))
+    result = search(service, FakeResponse(b'{"_embedded": {"events": []}}', error))
+    assert result['error'].startswith('API request failed')
+
+def test_malformed_payload_is_a_format_error(service):
+    result = search(service, FakeResponse(b'{"page": {}} trailing'))
+    assert result == {'success': False, 'error': 'Failed to format response', 'events': []}
+
+@pytest.mark.parametrize('payload', [
+    b'{"_embedded": null, "page": {"size": 1}}',
+    b'{"_embedded": {"events": null}}',
+    b'{"_embedded": {}, "page": null}',
+    b'{"_embedded": [], "page": {}}',
+    b'{"_embedded": {"events": {"id": "1"}}}',
+    b'{"_embedded": "events"}',
+    b'{"page": [1]}',
+    b'[]',
+    b'{"_embedded": {"events": [{"id": "1", "name": "Show"}]}}'
+])
+def test_streaming_and_buffered_paths_agree(service, payload):
+    buffered = service._format_events_response(json.loads(payload))
+    streamed = service._stream_events_response([payload[:7], payload[7:]])
+    assert streamed == buffered
+
+def test_cached_search_is_shared_between_workers(monkeypatch):
+    monkeypatch.setattr(Config, 'STREAM_EVENT_PARSING', True)
+    shared = FakeCacheCollection()
+    body = b'{"_embedded": {"events": [{"id": "1", "name": "Show"}]}}'
+    first, second = EventService(), EventService()
+    for worker in (first, second):
+        worker._shared_cache = shared
+
+    result = search(first, FakeResponse(body))
+
+    assert second.is_search_cached(keyword='rock')
+    assert search(second, FakeResponse(body)) == result
+    assert second._session.calls == 0
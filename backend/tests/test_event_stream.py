@@ -0,0 +1,91 @@
+import json
+import pytest
+from app.services.event_stream import parse_search_stream
+
+def chunked(raw, size):
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+def expected(raw):
+    data = json.loads(raw)
+    return (data.get('_embedded') or {}).get('events') or [], data.get('page') or {}
+
+def parse(raw, size):
+    return parse_search_stream(chunked(raw, size), lambda event: event)
+
+PAYLOADS = {
+    'events': {
+        '_embedded': {'events': [
+            {'id': '1', 'name': 'Café ✓ 東京 🎸', 'priceRanges': [{'min': 1.5, 'max': 1e3}]},
+            {'id': '2', 'name': 'Quote \\" and \\u00e9 escapes', 'size': -12345678901234567890},
+            {'id': '3', 'nested': {'a': [1, [2, {'b': None}], True, False]}}
+        ]},
+        '_links': {'self': {'href': '/events.json?page=1'}},
+        'page': {'size': 3, 'totalElements': 30, 'totalPages': 10, 'number': 12345}
+    },
+    'page_first': {'page': {'size': 1, 'number': 0}, '_embedded': {'events': [{'id': 'x'}]}},
+    'empty_events': {'_embedded': {'events': []}, 'page': {'size': 0}},
+    'no_events_key': {'_embedded': {'venues': [{'id': 'v'}]}, 'page': {'size': 0}},
+    'no_embedded': {'page': {'size': 0, 'totalElements': 0}},
+    'null_embedded': {'_embedded': None, 'page': {'size': 1}},
+    'null_events': {'_embedded': {'events': None}, 'page': None},
+    'empty_object': {}
+}
+
+@pytest.mark.parametrize('name', PAYLOADS)
+@pytest.mark.parametrize('indent', [None, 2])
+def test_matches_json_loads_for_every_chunk_size(name, indent):
+    raw = json.dumps(PAYLOADS[name], indent=indent, ensure_ascii=False).encode('utf-8')
+    for size in range(1, len(raw) + 1):
+        assert parse(raw, size) == expected(raw), f'chunk size {size}'
+
+def test_multibyte_characters_split_across_chunks():
+    raw = '{"_embedded": {"events": [{"name": "🎸東京é"}]}}'.encode('utf-8')
+    start = raw.index('🎸'.encode('utf-8'))
+    # Cut inside the 4-byte emoji and the 3-byte CJK characters
+    chunks = [raw[:start + 1], raw[start + 1:start + 3], raw[start + 3:start + 6], raw[start + 6:]]
+    events, _ = parse_search_stream(chunks, lambda event: event)
+    assert events == [{'name': '🎸東京é'}]
+
+def test_empty_chunks_are_skipped():
+    raw = b'{"page": {"size": 7}}'
+    chunks = [b'', raw[:5], b'', b'', raw[5:], b'']
+    assert parse_search_stream(chunks, lambda event: event) == ([], {'size': 7})
+
+def test_number_split_at_end_of_chunk():
+    raw = b'{"page": {"number": 1234567}}'
+    for size in range(1, len(raw) + 1):
+        assert parse(raw, size) == ([], {'number': 1234567})
+
+def test_events_are_formatted_as_they_stream():
+    raw = json.dumps(PAYLOADS['events']).encode('utf-8')
+    events, _ = parse_search_stream(chunked(raw, 16), lambda event: event['id'])
+    assert events == ['1', '2', '3']
+
+@pytest.mark.parametrize('raw', [
+    b'',
+    b'   ',
+    b'{',
+    b'{"page": {',
+    b'{"_embedded": {"events": [{"id": 1}',
+    b'{"_embedded": {"events": [{"id": 1},]}}',
+    b'{"page" 1}',
+    b'{"page": 1,}',
+    b'{"page": tru}',
+    b'[1, 2]',
+    b'"string"',
+    b'{"page": {}} trailing',
+    b'{"page": {}}{}',
+    b'{1: 2}',
+    b'{null: {}}',
+    b'{"_embedded": {"events": {"id": 1}}}',
+    b'{"_embedded": "events"}',
+    b'{"page": [1]}',
+    b'\xff\xfe{}'
+])
+def test_malformed_or_truncated_input_raises(raw):
+    for size in (1, 3, len(raw) or 1):
+        with pytest.raises(ValueError):
+            parse(raw, size)
+
+def test_trailing_whitespace_is_allowed():
+    assert parse(b'{"page": {}}  \n\t', 4) == ([], {})
@@ -0,0 +1,128 @@
+import time
+import pytest
+from app.config import Config
+from app.routes import routes
+from app.services.token_service import TokenService, token_service
+
+USER_ID = '507f1f77bcf86cd799439011'
+OTHER_USER_ID = '507f1f77bcf86cd799439012'
+
+class FakeUserModel:
+
+    def get_user_favorites(self, user_id):
+        return True, 'Favorites retrieved', []
+
+@pytest.fixture
+def service():
+    return TokenService()
+
+def auth(token):
+    return {'Authorization': f'Bearer {token}'}
+
+# ============= TOKEN SERVICE =============
+
+def test_issued_token_verifies(service):
+    payload = service.verify_token(service.issue_token(USER_ID))
+    assert payload['sub'] == USER_ID
+
+def test_tampered_payload_rejected(service):
+    body, signature = service.issue_token(USER_ID).split('.')
+    other_body = service.issue_token(OTHER_USER_ID).split('.')[0]
+    assert service.verify_token(f'{other_body}.{signature}') is None
+    assert service.verify_token(f'{body}.{signature[:-2]}xx') is None
+
+@pytest.mark.parametrize('token', ['', 'garbage', 'a.b.c', 'é.é', '.'])
+def test_malformed_token_rejected(service, token):
+    assert service.verify_token(token) is None
+
+def test_expired_token_rejected(service):
+    service.expiry_seconds = -1
+    assert service.verify_token(service.issue_token(USER_ID)) is None
+
+def test_cached_token_rejected_once_expired(service, monkeypatch):
+    token = service.issue_token(USER_ID)
+    assert service.verify_token(token) is not None
+
+    later = time.time() + service.expiry_seconds + 1
+    monkeypatch.setattr(time, 'time', lambda: later)
+    assert service.verify_token(token) is None
+
+def test_rotated_key_still_verifies(monkeypatch):
+    old_service = TokenService()
+    token = old_service.issue_token(USER_ID)
+
+    monkeypatch.setattr(Config, 'PREVIOUS_SECRET_KEYS', [Config.SECRET_KEY])
+    monkeypatch.setattr(Config, 'SECRET_KEY', 'rotated-secret-key')
+    rotated_service = TokenService()
+
+    assert rotated_service.verify_token(token)['sub'] == USER_ID
+    new_token = rotated_service.issue_token(USER_ID)
+    assert new_token.split('.')[0] != token.split('.')[0]
+    assert old_service.verify_token(new_token) is None
+
+def test_retired_key_rejected(monkeypatch):
+    token = TokenService().issue_token(USER_ID)
+
+    monkeypatch.setattr(Config, 'SECRET_KEY', 'rotated-secret-key')
+    assert TokenService().verify_token(token) is None
+
+def test_revoked_token_rejected(service):
+    token = service.issue_token(USER_ID)
+    payload = service.verify_token(token)
+
+    service.revoke_token(payload)
+    assert service.verify_token(token) is None
+
+def test_refresh_keeps_local_revocations(service):
+    class FakeCollection:
+        def find(self, *args, **kwargs):
+            return []
+
+    token = service.issue_token(USER_ID)
+    service.revoke_token(service.verify_token(token))
+
+    service._collection = FakeCollection()
+    service.refresh_denylist()
+    assert service.verify_token(token) is None
+
+def test_lru_evicts_oldest(service):
+    service.cache_size = 2
+    tokens = [service.issue_token(USER_ID) for _ in range(3)]
+    for token in tokens:
+        service.verify_token(token)
+
+    assert tokens[0] not in service._verified
+    assert all(token in service._verified for token in tokens[1:])
+    # Evicted tokens are still valid, just verified again
+    assert service.verify_token(tokens[0]) is not None
+
+# ============= token_required =============
+
+@pytest.fixture
+def user_model(monkeypatch):
+    monkeypatch.setattr(routes, 'user_model', FakeUserModel())
+
+def test_missing_token_is_401(client, user_model):
+    response = client.get(f'/api/users/{USER_ID}/favorites')
+    assert response.status_code == 401
+
+def test_invalid_token_is_401(client, user_model):
+    response = client.get(f'/api/users/{USER_ID}/favorites', headers=auth('garbage'))
+    assert response.status_code == 401
+
+def test_valid_token_is_accepted(client, user_model):
+    token = token_service.issue_token(USER_ID)
+    response = client.get(f'/api/users/{USER_ID}/favorites', headers=auth(token))
+    assert response.status_code == 200
+
+def test_other_users_favorites_is_403(client, user_model):
+    token = token_service.issue_token(USER_ID)
+    response = client.get(f'/api/users/{OTHER_USER_ID}/favorites', headers=auth(token))
+    assert response.status_code == 403
+
+def test_logout_revokes_token(client, user_model):
+    token = token_service.issue_token(USER_ID)
+
+    assert client.post('/api/auth/logout', headers=auth(token)).status_code == 200
+    response = client.get(f'/api/users/{USER_ID}/favorites', headers=auth(token))
+    assert response.status_code == 401
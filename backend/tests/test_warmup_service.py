@@ -0,0 +1,133 @@
+import pytest
+from pymongo.errors import DuplicateKeyError
+from app.config import Config
+from app.services import warmup_service as warmup_module
+from app.services.warmup_service import WarmupService
+
+class FakeEventService:
+
+    def __init__(self, cached=()):
+        self.cached = set(cached)
+        self.fetched = []
+
+    def is_search_cached(self, **params):
+        return params['keyword'] in self.cached
+
+    def search_events(self, refresh=False, **params):
+        self.fetched.append(params['keyword'])
+        return {'success': True, 'events': []}
+
+class FakeBudgetCollection:
+    """
+    Conditional upsert as Mongo runs it: update when the filter matches,
+    otherwise insert - which collides on _id once the window's document exists
+    """
+
+    def __init__(self):
+        self.docs = {}
+
+    def update_one(self, query, update, upsert=False):
+        doc = self.docs.get(query['_id'])
+        if doc is None:
+            self.docs[query['_id']] = dict(update['$setOnInsert'], calls=update['$inc']['calls'])
+        elif doc['calls'] < query['calls']['$lt']:
+            doc['calls'] += update['$inc']['calls']
+        else:
+            raise DuplicateKeyError('E11000 duplicate key error')
+
+@pytest.fixture
+def service(monkeypatch):
+    service = WarmupService()
+    service.request_delay = 0
+    for keyword, hits in [('rock', 3), ('jazz', 2), ('folk', 1)]:
+        for _ in range(hits):
+            service.record_search({'keyword': keyword, 'size': 20, 'page': 0})
+    return service
+
+def test_only_expired_entries_are_fetched(service, monkeypatch):
+    events = FakeEventService(cached=['jazz'])
+    monkeypatch.setattr(warmup_module, 'event_service', events)
+
+    service.warm_up()
+
+    assert events.fetched == ['rock', 'folk']
+    assert service.status()['skipped'] == 1
+
+def test_budget_is_shared_across_runs_in_a_window(service, monkeypatch):
+    events = FakeEventService()
+    monkeypatch.setattr(warmup_module, 'event_service', events)
+    service.upstream_budget = 2
+
+    service.warm_up()
+    service.warm_up()
+
+    assert events.fetched == ['rock', 'jazz']
+    assert service.status()['budget_exhausted'] is True
+
+def test_budget_resets_in_next_window(service, monkeypatch):
+    events = FakeEventService()
+    monkeypatch.setattr(warmup_module, 'event_service', events)
+    service.upstream_budget = 1
+
+    service.warm_up()
+    service._window_id -= 1
+    service.warm_up()
+
+    assert events.fetched == ['rock', 'rock']
+
+def test_budget_is_shared_between_workers_through_mongo(service, monkeypatch):
+    events = FakeEventService()
+    monkeypatch.setattr(warmup_module, 'event_service', events)
+    budget = FakeBudgetCollection()
+    other = WarmupService()
+    other.request_delay = 0
+    other.record_search({'keyword': 'blues'})
+    for worker in (service, other):
+        worker._budget_collection = budget
+        worker.upstream_budget = 2
+
+    service.warm_up()
+    other.warm_up()
+
+    assert events.fetched == ['rock', 'jazz']
+    assert other.status()['budget_exhausted'] is True
+    assert list(budget.docs.values())[0]['calls'] == 2
+
+def age_flushed_hits(service, buckets):
+    service._recent = {
+        (key, bucket - buckets): entry for (key, bucket), entry in service._recent.items()
+    }
+
+def test_ranking_follows_recent_traffic(service):
+    service.flush()
+    age_flushed_hits(service, service.window_buckets - 1)
+    service.record_search({'keyword': 'folk'})
+    service.record_search({'keyword': 'folk'})
+    service.record_search({'keyword': 'blues'})
+    service.flush()
+
+    # Still inside the window, older hits count alongside new ones
+    ranked = [params['keyword'] for params in service.get_popular_searches()]
+    assert ranked == ['rock', 'folk', 'jazz', 'blues']
+
+    # One bucket later the first hits have left the window
+    age_flushed_hits(service, 1)
+    ranked = [params['keyword'] for params in service.get_popular_searches()]
+    assert ranked == ['folk', 'blues']
+
+def test_searches_that_have_ended_are_not_replayed(service, monkeypatch):
+    events = FakeEventService()
+    monkeypatch.setattr(warmup_module, 'event_service', events)
+    for _ in range(5):
+        service.record_search({'keyword': 'past', 'endDate': '2020-01-31T00:00:00Z'})
+
+    service.warm_up()
+
+    assert events.fetched == ['rock', 'jazz', 'folk']
+
+def test_cache_ttl_must_outlive_interval(monkeypatch):
+    monkeypatch.setattr(Config, 'WARMUP_ENABLED', True)
+    monkeypatch.setattr(Config, 'EVENT_CACHE_TTL_SECONDS', Config.WARMUP_INTERVAL_SECONDS)
+
+    with pytest.raises(ValueError):
+        WarmupService()